@@ -1,147 +1,531 @@
+# Concurrent execution of independent coder steps
+import asyncio
+
+# Structural outlines of large Python files for coder prompts
+import ast
+import copy
+from   typing import Literal
+
+# Environment flags (e.g., BUILDBUDDY_DEBUG)
+import os
+
+# Monotonic clock for the LLM request token bucket
+import time
+
+# Stable cache keys for idempotent LLM nodes
+import hashlib
+
 # Load environment variables securely from .env file
 from dotenv                     import load_dotenv
 
-# Enable LangChain debug and verbose logging for traceability
+# LangChain debug and verbose logging for traceability
 from langchain.globals          import set_verbose, set_debug
 
+# Shared HTTP/2 connection pool for all async LLM calls
+import httpx
+
+# Fast JSON serialization for TaskPlan audit logging
+import orjson
+
+# Fast JSON decoding of structured LLM responses
+import msgspec
+
 # Use Groq-hosted OSS GPT model for fast, cost-effective inference
 from langchain_groq.chat_models import ChatGroq
 
+# Retry rate-limited (HTTP 429) and transient (408/409/5xx, network) LLM failures with exponential backoff
+from groq                       import APIConnectionError, APIStatusError, BadRequestError, ConflictError, InternalServerError, RateLimitError
+from tenacity                   import retry, retry_if_exception, stop_after_attempt, wait_exponential
+
 # Wraps Python functions as agent-callable tools with name and input schema support.
 from langchain_core.tools       import Tool
 
+# Message types for the hand-rolled coder tool-call loop
+from langchain_core.messages    import SystemMessage, HumanMessage, ToolMessage
+from langchain_core.exceptions  import OutputParserException
+
 # LangGraph constants and primitives for graph orchestration
 from langgraph.constants        import END
 from langgraph.graph            import StateGraph
-from langgraph.prebuilt         import create_react_agent
+
+# Node-level result caching for idempotent LLM nodes
+from langgraph.cache.base       import BaseCache
+from langgraph.cache.sqlite     import SqliteCache
+from langgraph.types            import CachePolicy, Command
 
 # Modular imports for prompts, state schemas, and tool functions
 from agent.prompts              import *
 from agent.states               import *
-from agent.tools                import write_file, read_file, get_current_directory, list_files
+from agent.tools                import write_file, read_file, get_current_directory, list_files, persist_to, cleanup_project_root, TRUNCATION_MARKER
 
 # Load environment variables (e.g., API keys) into runtime
 _ = load_dotenv()
 
-# Enable verbose and debug logs for audit clarity and troubleshooting
-set_debug  (True)
-set_verbose(True)
+# Enable verbose and debug logs only when BUILDBUDDY_DEBUG=1 (they hook every chain call)
+_DEBUG = os.getenv("BUILDBUDDY_DEBUG") == "1"
+set_debug  (_DEBUG)
+set_verbose(_DEBUG)
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Rate limiting: cap in-flight LLM calls and pace them to the provider's RPM
+# ─────────────────────────────────────────────────────────────────────────────
+class TokenBucket:
+    """
+    Async token bucket refilled at `rate` tokens per second, holding at most `capacity`.
+    Each acquire() takes one token, sleeping until one is available.
+    """
+    def __init__(self, rate: float, capacity: float):
+        self.rate     = rate
+        self.capacity = capacity
+        self.tokens   = capacity
+        self.updated  = time.monotonic()
+        self.lock     = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self.lock:
+            while True:
+                now          = time.monotonic()
+                self.tokens  = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
 
-# Initialize LLM with structured output support (Groq-hosted GPT OSS 120B)
-llm = ChatGroq(model="openai/gpt-oss-120b", max_tokens=8000)
+
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "8"))       # Max concurrent LLM requests
+LLM_RPM         = int(os.getenv("LLM_RPM",         "30"))      # Provider requests-per-minute budget
+if LLM_CONCURRENCY <= 0 or LLM_RPM <= 0:
+    raise ValueError("LLM_CONCURRENCY and LLM_RPM must be positive integers")
 
 # Create dedicated LLM for tool calling (uses Groq's tool-optimized model)
 # coder_llm = ChatGroq(model="llama-3.3-70b-versatile", max_tokens=8000, temperature=0)
 
-def planner_agent(state: dict) -> dict:
+# Plans with at most this many steps are generated by bulk_coder in a single LLM call
+BULK_CODER_MAX_STEPS = 8
+
+# Completion budget for that call — it carries every file, and gpt-oss reasoning tokens count too
+BULK_CODER_MAX_TOKENS = 32000
+
+# Existing file content longer than this is truncated (or outlined) in coder prompts
+EXISTING_CONTENT_MAX_CHARS = 8000
+
+# Upper bound on LLM ↔ tool round trips per coder step
+CODER_MAX_TOOL_ROUNDS = 12
+
+# Coder tools are built once and reused by every step
+_CODER_TOOLS         = [read_file, write_file, list_files, get_current_directory]
+_TOOLS_BY_NAME       = {t.name: t for t in _CODER_TOOLS}
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Per-event-loop LLM resources: HTTP/2 client, LLM runnables and rate limiters
+# ─────────────────────────────────────────────────────────────────────────────
+class LoopResources:
     """
-    Step 1: - Convert a raw user prompt into a structured Plan object.
-            - Uses planner_prompt() to guide LLM response
-            - Ensures output conforms to Plan schema
+    Everything bound to one event loop (one per asyncio.run): the keep-alive HTTP/2
+    client shared by every concurrent LLM call, the LLMs using it, and the
+    concurrency semaphore and token bucket that pace those calls.
+    """
+    def __init__(self):
+        self.http_client = httpx.AsyncClient(
+                                              http2   = True,
+                                              timeout = 60,
+                                              limits  = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+                                            )
+
+        # Initialize LLM with structured output support (Groq-hosted GPT OSS 120B)
+        # max_retries=0: invoke_llm is the single retry layer (429, 408/409, 5xx, network), so every attempt is paced
+        llm              = ChatGroq(model="openai/gpt-oss-120b", max_tokens=8000, max_retries=0, http_async_client=self.http_client)
+
+        # JSON-mode LLM whose raw output is decoded with msgspec (skips Pydantic validation)
+        self.json_llm    = llm.bind(response_format={"type": "json_object"})
+
+        # Structured-output LLM for bulk_coder, with the larger completion budget
+        self.bulk_llm    = ChatGroq(
+                                     model             = "openai/gpt-oss-120b",
+                                     max_tokens        = BULK_CODER_MAX_TOKENS,
+                                     max_retries       = 0,
+                                     http_async_client = self.http_client
+                                   ).with_structured_output(BulkFiles, method="json_mode", strict=True)
+
+        # Tool-bound LLM reused by every coder step
+        self.coder_llm   = llm.bind_tools(_CODER_TOOLS)
+
+        self.sem         = asyncio.Semaphore(LLM_CONCURRENCY)
+        self.bucket      = TokenBucket(rate=LLM_RPM / 60, capacity=LLM_CONCURRENCY)
+
+
+# asyncio primitives and pooled connections belong to the loop that first uses them
+_LOOP_RESOURCES : dict[asyncio.AbstractEventLoop, LoopResources] = {}
+
+
+def loop_resources() -> LoopResources:
+    """
+    Returns the LoopResources of the running event loop, creating them on first use
+    and dropping the resources of loops that have since closed.
+    """
+    loop      = asyncio.get_running_loop()
+    resources = _LOOP_RESOURCES.get(loop)
+    if resources is None:
+        for closed in [l for l in _LOOP_RESOURCES if l.is_closed()]:
+            del _LOOP_RESOURCES[closed]
+        resources = _LOOP_RESOURCES[loop] = LoopResources()
+    return resources
+
+
+async def aclose_loop_resources() -> None:
+    """
+    Closes the running loop's HTTP client and forgets its resources.
+    Must run before the loop ends; run_agent() does this after every run.
+    """
+    resources = _LOOP_RESOURCES.pop(asyncio.get_running_loop(), None)
+    if resources is not None:
+        await resources.http_client.aclose()
+
+
+def _is_transient(e: BaseException) -> bool:
+    """
+    True for the failures the groq SDK itself would retry: 408, 409, 429, 5xx,
+    timeouts and connection errors (its own retries are off, see max_retries=0).
+    """
+    if isinstance(e, (RateLimitError, ConflictError, InternalServerError, APIConnectionError)):
+        return True
+    return isinstance(e, APIStatusError) and e.status_code == 408
+
+
+@retry(
+        retry    = retry_if_exception(_is_transient),
+        wait     = wait_exponential(min=1, max=30),
+        stop     = stop_after_attempt(6),
+        reraise  = True
+      )
+async def invoke_llm(runnable, llm_input):
+    """
+    Awaits runnable.ainvoke(llm_input) within the request budget.
+    Waits for a rate-limit token, then a concurrency slot; retries transient failures.
+    """
+    resources = loop_resources()
+    await resources.bucket.acquire()
+    async with resources.sem:
+        return await runnable.ainvoke(llm_input)
+
+async def plan_and_architect(state: AgentState) -> dict:
+    """
+    Step 1: - Convert a raw user prompt into a Plan and its TaskPlan in one LLM call.
+            - Uses plan_and_architect_prompt() to guide LLM response
+            - Decodes output against the PlanAndTasksStruct wire schema (msgspec)
+            - Injects the Plan into the TaskPlan for traceability
     """
     user_prompt = state["user_prompt"]
-    resp        = llm.with_structured_output(Plan).invoke(planner_prompt(user_prompt))
+    raw         = await invoke_llm(loop_resources().json_llm, plan_and_architect_prompt(user_prompt))
 
-    if resp is None:
-        raise ValueError("Planner did not return a valid response.")
-    return {"plan": resp}
+    try:
+        resp    = msgspec.json.decode(raw.content, type=PlanAndTasksStruct)
+    except msgspec.DecodeError as e:
+        raise ValueError("Planner/Architect did not return a valid response.") from e
+
+    # Attach the original Plan to TaskPlan for downstream context
+    plan            = resp.plan.to_model()
+    task_plan       = resp.task_plan.to_model()
+    task_plan.plan  = plan
+    if _DEBUG:
+        print(orjson.dumps(task_plan.model_dump()).decode())     # Optional: log TaskPlan for audit/debug
+    return {"plan": plan, "task_plan": task_plan}
+
+
+def route_after_plan(state: AgentState) -> Literal["bulk_coder", "coder"]:
+    """
+    Routes small TaskPlans to bulk_coder (one LLM call for every file)
+    and larger ones to the step-by-step coder loop.
+    """
+    steps = state["task_plan"].implementation_steps
+    return "bulk_coder" if len(steps) <= BULK_CODER_MAX_STEPS else "coder"
+
+
+async def _write_bulk_file(path: str, content: str) -> str:
+    """
+    Writes one bulk_coder file; errors (e.g. a path outside the project root)
+    are returned as "ERROR: ..." like run_tool_call, instead of being raised.
+    """
+    try:
+        return await write_file.coroutine(path, content)
+    except Exception as e:
+        return f"ERROR: {path}: {e}"
 
 
-def architect_agent(state: dict) -> dict:
+async def bulk_coder(state: AgentState) -> Command[Literal["coder", "__end__"]]:
     """
-    Step 2: - Convert the Plan into a TaskPlan with implementation steps.
-            - Uses the architect_prompt() to guide LLM response
-            - Injects original Plan into the TaskPlan for traceability
+    Step 2 (small plans): - Generate every file of the TaskPlan in one LLM call.
+                          - Uses bulk_coder_prompt() to guide LLM response
+                          - Ensures output conforms to BulkFiles schema
+                          - Writes all files concurrently via write_file (last entry per path wins)
+                          - Falls back to the coder loop when the reply is truncated or invalid,
+                            a write fails, or a planned file is missing
     """
-    plan : Plan = state["plan"]
-    resp        = llm.with_structured_output(TaskPlan, method="json_mode", strict=True).invoke(architect_prompt(plan=plan.model_dump_json()))
+    task_plan : TaskPlan = state["task_plan"]
+    try:
+        resp             = await invoke_llm(loop_resources().bulk_llm, bulk_coder_prompt(task_plan.model_dump_json()))
+    except (OutputParserException, BadRequestError, ValueError):
+        resp             = None     # Truncated / invalid JSON (Groq rejects failed json_object replies with 400)
 
     if resp is None:
-        raise ValueError("Architect did not return a valid response.")
+        # Generate the files step by step instead
+        return Command(goto="coder")
 
-    # Attach the original Plan to TaskPlan for downstream context
-    resp.plan  = plan
-    print(resp.model_dump_json())     # Optional: log TaskPlan for audit/debug
-    return {"task_plan" : resp}
+    # Duplicate paths would race each other — keep only the last entry per path
+    files                = {os.path.normpath(f.path): f.content for f in resp.files}
+    results              = await asyncio.gather(*[_write_bulk_file(path, content) for path, content in files.items()])
+    written              = {path for path, result in zip(files, results) if not result.startswith("ERROR:")}
 
+    # Every planned file must have been written — otherwise finish the plan step by step
+    planned              = {os.path.normpath(step.filepath) for step in task_plan.implementation_steps}
+    missing              = planned - written
+    errors               = [result for result in results if result.startswith("ERROR:")]
+    if missing or errors:
+        print(*errors, *[f"MISSING: {path}" for path in sorted(missing)], sep="\n")
+        return Command(goto="coder")
+    return Command(update={"status": "DONE"}, goto=END)
 
-def coder_agent(state: dict) -> dict:
+
+def next_step_wave(steps: list[ImplementationTask], start: int) -> list[ImplementationTask]:
     """
-    Step 3: - Execute the implementation steps using a LangGraph tool-using agent.
-            - Reads the current step from TaskPlan
-            - Loads existing file content
-            - Invokes react_agent with system + user prompt
-            - Increments step index for next iteration
+    Returns the next wave of independent steps, starting at index `start`.
+    A wave is the longest run of consecutive steps that target distinct files
+    and whose descriptions do not mention a file written earlier in the same wave,
+    so no two steps in flight write the same file and every step can build on
+    the files its description refers to.
     """
-    coder_state: CoderState = state.get("coder_state")
+    wave      = []
+    filepaths = set()
+    for step in steps[start:]:
+        if step.filepath in filepaths:
+            break
+        if any(path in step.task_description or os.path.basename(path) in step.task_description
+               for path in filepaths):
+            break  # Depends on a file still being written in this wave
+        filepaths.add(step.filepath)
+        wave.append(step)
+    return wave
 
-    if coder_state is None:
-        # Initialize the coder state with the first step
-        coder_state  = CoderState(task_plan=state["task_plan"], current_step_idx=0)
 
-    steps            = coder_state.task_plan.implementation_steps
-    if coder_state.current_step_idx >= len(steps):
-        # All steps completed — signal graph termination
-        return {"coder_state": coder_state, "status": "DONE"}
+def _python_outline(src: str) -> str:
+    """
+    Returns the imports and top-level def/class signatures of Python source.
+    Class bodies keep their method signatures; every body is elided with "...".
+    Raises SyntaxError if src does not parse.
+    """
+    elided = [ast.Expr(ast.Constant(...))]
+    lines  = []
+    for node in ast.parse(src).body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            lines.append(ast.unparse(node))
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            stub      = copy.copy(node)
+            stub.body = elided
+            lines.append(ast.unparse(stub))
+        elif isinstance(node, ast.ClassDef):
+            stub      = copy.copy(node)
+            stub.body = []
+            for member in node.body:
+                if isinstance(member, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    method      = copy.copy(member)
+                    method.body = elided
+                    stub.body.append(method)
+            stub.body = stub.body or elided
+            lines.append(ast.unparse(stub))
+    return "\n".join(lines)
+
+
+def _summarize(src: str, filepath: str, max_chars: int = EXISTING_CONTENT_MAX_CHARS) -> str:
+    """
+    Shrinks existing file content before it is injected into a coder prompt.
+    Short content is returned as-is; large .py files become a structural outline,
+    anything else keeps its head and tail around TRUNCATION_MARKER.
+    """
+    if len(src) <= max_chars:
+        return src
 
-    current_task     = steps[coder_state.current_step_idx]
-    existing_content = read_file.run(current_task.filepath)
+    if filepath.endswith(".py"):
+        try:
+            outline = _python_outline(src)
+            if outline and len(outline) <= max_chars:
+                return f"{outline}\n# {TRUNCATION_MARKER}"
+        except SyntaxError:
+            pass  # Fall back to head + tail for unparsable source
+    half = max_chars // 2
+    return f"{src[:half]}\n{TRUNCATION_MARKER}\n{src[-half:]}"
 
-    # Construct prompts for tool-using agent
-    system_prompt    = coder_system_prompt()
+
+async def run_tool_call(call: dict) -> ToolMessage:
+    """
+    Executes one tool call requested by the coder LLM.
+    Unknown tools and tool errors are reported back to the LLM, not raised.
+    """
+    tool = _TOOLS_BY_NAME.get(call["name"])
+    if tool is None:
+        result = f"ERROR: {call['name']} is not a valid tool, try one of [{', '.join(_TOOLS_BY_NAME)}]."
+    else:
+        try:
+            result = await tool.ainvoke(call["args"])
+        except Exception as e:
+            result = f"ERROR: {e}"
+    return ToolMessage(content=str(result), name=call["name"], tool_call_id=call["id"])
+
+
+async def run_coder_step(current_task: ImplementationTask) -> None:
+    """
+    Executes a single implementation step with a tool-calling loop.
+    Loads existing file content, then alternates LLM calls and tool calls
+    until the LLM stops requesting tools (or CODER_MAX_TOOL_ROUNDS is hit).
+    """
+    existing_content = read_file.func(current_task.filepath)     # Plain call — skips tool dispatch
+
+    # Construct user prompt for tool-using agent
+    # (large content is shortened; write_file refuses any copy carrying TRUNCATION_MARKER)
     user_prompt      = (
                             f"Task             : {current_task.task_description}\n"
                             f"File             : {current_task.filepath}\n"
-                            f"Existing content :\n{existing_content}\n"
+                            f"Existing content :\n{_summarize(existing_content, current_task.filepath)}\n"
                             "Use write_file(path, content) to save your changes."
                        )
 
-    # Register available tools for agent execution
-    coder_tools      = [read_file, write_file, list_files, get_current_directory]    
-    react_agent      = create_react_agent(llm, coder_tools)
+    messages         = [SystemMessage(CODER_SYSTEM_PROMPT), HumanMessage(user_prompt)]
+    for _ in range(CODER_MAX_TOOL_ROUNDS):
+        ai_message   = await invoke_llm(loop_resources().coder_llm, messages)
+        messages.append(ai_message)
+        if not ai_message.tool_calls:
+            break
 
-    # Invoke agent with structured prompt
-    react_agent.invoke({
-                            "messages": [
-                                            {"role": "system", "content": system_prompt},
-                                            {"role": "user",   "content": user_prompt}
-                                        ]
-                       })
-    
-    # Move to the next step in TaskPlan
-    coder_state.current_step_idx += 1
-    return {"coder_state": coder_state}
+        # Tool calls of one LLM turn are independent — run them concurrently
+        messages.extend(await asyncio.gather(*[run_tool_call(call) for call in ai_message.tool_calls]))
+
+
+async def coder_agent(state: AgentState) -> Command[Literal["coder", "__end__"]]:
+    """
+    Step 2 (large plans): - Execute the implementation steps using a tool-calling coder loop.
+                          - Reads the next wave of independent steps from TaskPlan
+                          - Runs every step of the wave concurrently (one file per step)
+                          - Advances step index past the wave for next iteration
+                          - Routes itself: loops back to coder, or ends the graph when done
+    """
+    coder_state: CoderState = state.get("coder_state")
+
+    if coder_state is None:
+        # Initialize the coder state with the first step
+        coder_state  = CoderState(task_plan=state["task_plan"], current_step_idx=0)
+
+    steps            = coder_state.task_plan.implementation_steps
+    if coder_state.current_step_idx >= len(steps):
+        # All steps completed — terminate the graph directly
+        return Command(update={"coder_state": coder_state, "status": "DONE"}, goto=END)
+
+    # Steps touching distinct, unreferenced files are independent — run them together
+    wave             = next_step_wave(steps, coder_state.current_step_idx)
+    await asyncio.gather(*[run_coder_step(step) for step in wave])
+
+    # Move past the completed wave in TaskPlan
+    coder_state.current_step_idx += len(wave)
+    return Command(update={"coder_state": coder_state}, goto="coder")
 
 
 # Define LangGraph execution flow using StateGraph
-graph               = StateGraph(dict)
+graph               = StateGraph(AgentState)
 
 # Register nodes (modular agents)
-graph.add_node("planner",   planner_agent)
-graph.add_node("architect", architect_agent)
-graph.add_node("coder",     coder_agent)
+# plan_and_architect is a pure function of user_prompt — cache its result for a day
+graph.add_node(
+                "plan_and_architect",
+                plan_and_architect,
+                cache_policy = CachePolicy(
+                                            key_func = lambda s: hashlib.sha256(s.get("user_prompt", "").encode("utf-8")).hexdigest(),
+                                            ttl      = 86400
+                                          )
+              )
+graph.add_node("bulk_coder",         bulk_coder)
+graph.add_node("coder",              coder_agent)
 
 # Define directed edges between nodes
-graph.add_edge("planner",   "architect")
-graph.add_edge("architect", "coder")
-
-# Conditional edge: loop coder until all steps are done
-graph.add_conditional_edges(
-                            "coder",
-                             lambda s: "END" if s.get("status") == "DONE" else "coder",
-                            {"END": END, "coder": "coder"}
-                           )
+# Small plans go to bulk_coder (one LLM call), larger ones to the coder loop
+graph.add_conditional_edges("plan_and_architect", route_after_plan)
+# bulk_coder and coder route themselves via Command — no conditional-edge router needed
 
 # Set the entry point for graph execution
-graph.set_entry_point("planner")
+graph.set_entry_point("plan_and_architect")
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Node cache: SQLite file opened on first use, never at import time
+# ─────────────────────────────────────────────────────────────────────────────
+def _cache_path() -> str:
+    """
+    Returns the node-cache database path, creating its parent directory.
+    Honors BUILDBUDDY_CACHE; otherwise uses $XDG_CACHE_HOME/buildbuddy (default ~/.cache).
+    """
+    path = os.environ.get("BUILDBUDDY_CACHE")
+    if not path:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        path = os.path.join(base, "buildbuddy", "langgraph_cache.db")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    return path
+
+
+class LazySqliteCache(BaseCache):
+    """
+    SqliteCache wrapper that connects (and sets WAL) on the first cache access.
+    Importing the graph therefore touches no files.
+    """
+    def __init__(self):
+        super().__init__()
+        self._cache = None
+
+    @property
+    def cache(self) -> SqliteCache:
+        if self._cache is None:
+            self._cache = SqliteCache(path=_cache_path())
+        return self._cache
+
+    def get(self, keys):
+        return self.cache.get(keys)
+
+    async def aget(self, keys):
+        return await self.cache.aget(keys)
+
+    def set(self, pairs):
+        self.cache.set(pairs)
+
+    async def aset(self, pairs):
+        await self.cache.aset(pairs)
+
+    def clear(self, namespaces=None):
+        self.cache.clear(namespaces)
+
+    async def aclear(self, namespaces=None):
+        await self.cache.aclear(namespaces)
+
 
 # Compile graph into executable agent
-agent       = graph.compile()
+agent       = graph.compile(cache=LazySqliteCache())
+
+
+async def run_agent(inputs: dict, config: dict | None = None) -> dict:
+    """
+    Runs the agent once and closes the event loop's HTTP client afterwards,
+    so no pooled connection outlives the loop that opened it.
+    """
+    try:
+        return await agent.ainvoke(inputs, config)
+    finally:
+        await aclose_loop_resources()
 
 # Entry point for manual testing or CLI invocation
 if __name__ == "__main__":
-    result  = agent.invoke(
-                             {"user_prompt"     : "Build a colourful modern todo app in html css and js"},
-                            {"recursion_limit" : 100}
-                           )
-    print("Final State:", result)
\ No newline at end of file
+    try:
+        result  = asyncio.run(run_agent(
+                                         {"user_prompt"     : "Build a colourful modern todo app in html css and js"},
+                                         {"recursion_limit" : 100}
+                                        ))
+        print("Final State:", result)
+    finally:
+        saved   = persist_to(os.path.join(os.getcwd(), "generated_project"))
+        if saved:
+            print("Project saved to:", saved)
+        cleanup_project_root()
\ No newline at end of file
@@ -1,33 +1,10 @@
 # ─────────────────────────────────────────────────────────────────────────────
-# Prompt: Planner agent — Converts user request into structured engineering plan
+# Prompt: Planner + Architect — Converts user request into plan and ordered tasks
 # ─────────────────────────────────────────────────────────────────────────────
-def planner_prompt(user_prompt: str) -> str:
-    """
-    Constructs the prompt for the PLANNER agent.
-    Injects the raw user request into a scaffold that guides the LLM to produce:
-    - App name, description, tech stack, features, and file layout.
-    """
-    PLANNER_PROMPT = f"""
-You are the PLANNER agent. Convert the user prompt into a COMPLETE engineering project plan.
-
-User request:
-{user_prompt}
-    """
-    return PLANNER_PROMPT
-
-# ─────────────────────────────────────────────────────────────────────────────
-# Prompt: Architect agent — Converts Plan into ordered implementation tasks
-# ─────────────────────────────────────────────────────────────────────────────
-def architect_prompt(plan: str) -> str:
-    """
-    Constructs the prompt for the ARCHITECT agent.
-    Injects the Plan JSON and guides the LLM to:
-    - Create IMPLEMENTATION TASKS for each file
-    - Specify exact logic, naming, dependencies, and integration details
-    - Maintain order and context across steps
-    """
-    ARCHITECT_PROMPT = f"""
-You are the ARCHITECT agent. Given this project plan, break it down into explicit engineering tasks.
+_PLAN_AND_ARCHITECT_TPL = """
+You are the PLANNER and ARCHITECT agent.
+First, convert the user prompt into a COMPLETE engineering project plan.
+Then, break that plan down into explicit engineering tasks.
 
 RULES:
 - For each FILE in the plan, create one or more IMPLEMENTATION TASKS.
@@ -41,34 +18,86 @@ RULES:
 
 Return your response as a JSON object with this exact schema:
 {{
-  "implementation_steps": [
+  "plan": {{
+    "name": "Name of the app",
+    "description": "One-line description of the app",
+    "techstack": "Tech stack to be used",
+    "features": ["Feature the app should support"],
+    "files": [
+      {{
+        "path": "path/to/file",
+        "purpose": "Purpose of the file"
+      }}
+    ]
+  }},
+  "task_plan": {{
+    "implementation_steps": [
+      {{
+        "filepath": "path/to/file",
+        "task_description": "Detailed description of what to implement in this file..."
+      }}
+    ]
+  }}
+}}
+
+IMPORTANT: Use "implementation_steps" as the task_plan field name (not "tasks"). Each step must have exactly two fields: "filepath" and "task_description".
+
+User request:
+{user_prompt}
+"""
+
+def plan_and_architect_prompt(user_prompt: str) -> str:
+    """
+    Constructs the combined prompt for the PLANNER and ARCHITECT agents.
+    Injects the raw user request and guides the LLM, in a single response, to:
+    - Produce the plan: app name, description, tech stack, features, and file layout
+    - Create IMPLEMENTATION TASKS for each file of that plan
+    - Specify exact logic, naming, dependencies, and integration details
+    - Maintain order and context across steps
+    """
+    return _PLAN_AND_ARCHITECT_TPL.format(user_prompt=user_prompt)
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Prompt: Bulk coder — Implements every task of a small TaskPlan in one response
+# ─────────────────────────────────────────────────────────────────────────────
+_BULK_CODER_TPL = """
+You are the CODER agent.
+You are implementing ALL engineering tasks of a small project at once by writing COMPLETE file content.
+
+RULES:
+- Implement every implementation step of the task plan below.
+- Emit each file exactly ONCE with its ENTIRE final content, merging all steps that target it.
+- NEVER generate patch/diff format (e.g., "@@", "---", "+++", "*** Begin Patch").
+- Maintain consistent naming of variables, functions, classes, and imports across files.
+- When a module is imported from another file, ensure it is included and implemented as described.
+
+Return your response as a JSON object with this exact schema:
+{{
+  "files": [
     {{
-      "filepath": "path/to/file",
-      "task_description": "Detailed description of what to implement in this file..."
+      "path": "path/to/file",
+      "content": "Complete file content..."
     }}
   ]
 }}
 
-IMPORTANT: Use "implementation_steps" as the root field name (not "tasks"). Each step must have exactly two fields: "filepath" and "task_description".
+Task Plan:
+{task_plan}
+"""
 
-Project Plan:
-{plan}
+def bulk_coder_prompt(task_plan: str) -> str:
     """
-    return ARCHITECT_PROMPT
+    Constructs the prompt for the single-call BULK CODER.
+    Injects the TaskPlan JSON and guides the LLM to:
+    - Implement every step and merge steps that share a file
+    - Return full content for every file in one JSON response
+    """
+    return _BULK_CODER_TPL.format(task_plan=task_plan)
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Prompt: Coder agent — System-level instructions for tool-using implementation
 # ─────────────────────────────────────────────────────────────────────────────
-def coder_system_prompt() -> str:
-    """
-    Constructs the system prompt for the CODER agent.
-    Guides the agent to:
-    - Read existing files for compatibility
-    - Implement full file content with modular integration
-    - Maintain naming consistency and validate imports
-    """
-
-    CODER_SYSTEM_PROMPT = """
+CODER_SYSTEM_PROMPT = """
 You are the CODER agent.
 You are implementing a specific engineering task by writing COMPLETE file content.
 
@@ -90,5 +119,14 @@ RULES:
 - When a module is imported from another file, ensure it exists and is implemented as described.
 
 Remember: Your output must be a COMPLETE working file, not a patch or commentary.
+"""
+
+def coder_system_prompt() -> str:
+    """
+    Constructs the system prompt for the CODER agent.
+    Guides the agent to:
+    - Read existing files for compatibility
+    - Implement full file content with modular integration
+    - Maintain naming consistency and validate imports
     """
     return CODER_SYSTEM_PROMPT
\ No newline at end of file
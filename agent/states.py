@@ -1,5 +1,6 @@
-from typing   import Optional                        # Core typing support for optional fields
+from typing   import Optional, TypedDict             # Core typing support for optional fields and graph state
 from pydantic import BaseModel, Field, ConfigDict    # Pydantic for schema validation and structured data modeling
+import msgspec                                       # Fast JSON decoding for on-wire LLM responses
 
 
 # ────────────────────────────────────────────────────────────────────────────────────────
@@ -61,6 +62,74 @@ class TaskPlan(BaseModel):
                                                            )
     model_config         = ConfigDict(extra="allow")          # Allows extra fields for flexibility during LLM output parsing
 
+# ────────────────────────────────────────────────────────────────────────────────────────
+# On-wire structs: msgspec mirrors of Plan/TaskPlan for decoding raw LLM JSON,
+# returned together by plan_and_architect as PlanAndTasksStruct.
+# to_model() builds the Pydantic models via model_construct (no re-validation).
+# ────────────────────────────────────────────────────────────────────────────────────────
+class FileStruct(msgspec.Struct):
+    path                 : str
+    purpose              : str
+
+    def to_model(self) -> File:
+        return File.model_construct(path=self.path, purpose=self.purpose)
+
+
+class PlanStruct(msgspec.Struct):
+    name                 : str
+    description          : str
+    techstack            : str
+    features             : list[str]
+    files                : list[FileStruct]
+
+    def to_model(self) -> Plan:
+        return Plan.model_construct(
+                                     name        = self.name,
+                                     description = self.description,
+                                     techstack   = self.techstack,
+                                     features    = self.features,
+                                     files       = [f.to_model() for f in self.files]
+                                   )
+
+
+class ImplementationTaskStruct(msgspec.Struct):
+    filepath             : str
+    task_description     : str
+
+    def to_model(self) -> ImplementationTask:
+        return ImplementationTask.model_construct(filepath=self.filepath, task_description=self.task_description)
+
+
+class TaskPlanStruct(msgspec.Struct):
+    implementation_steps : list[ImplementationTaskStruct]
+
+    def to_model(self) -> TaskPlan:
+        return TaskPlan.model_construct(implementation_steps=[step.to_model() for step in self.implementation_steps])
+
+
+class PlanAndTasksStruct(msgspec.Struct):
+    plan                 : PlanStruct
+    task_plan            : TaskPlanStruct
+
+# ────────────────────────────────────────────────────────────────────────────────────────
+# Full file content emitted by bulk_coder
+# ────────────────────────────────────────────────────────────────────────────────────────
+class FileOut(BaseModel):
+    path    : str = Field(
+                            description = "Path to the file to be written, relative to the project root."
+                         )
+    content : str = Field(
+                            description = "COMPLETE content of the file. Written as-is by bulk_coder."
+                         )
+
+# ────────────────────────────────────────────────────────────────────────────────────────
+# BulkFiles: Every project file generated in a single LLM call
+# ────────────────────────────────────────────────────────────────────────────────────────
+class BulkFiles(BaseModel):
+    files                : list[FileOut] = Field(
+                                                  description = "All files of the project, each with its path and full content."
+                                                )
+
 # ────────────────────────────────────────────────────────────────────────────────────────
 # CoderState: Tracks progress through TaskPlan
 # ────────────────────────────────────────────────────────────────────────────────────────
@@ -75,4 +144,14 @@ class CoderState(BaseModel):
     current_file_content : Optional[str] = Field(
                                                   None,
                                                   description = "Content of the file currently being edited. Used for context injection into coder_agent prompts."
-                                                )
\ No newline at end of file
+                                                )
+
+# ────────────────────────────────────────────────────────────────────────────────────────
+# AgentState: Shared LangGraph state passed between nodes
+# ────────────────────────────────────────────────────────────────────────────────────────
+class AgentState(TypedDict, total=False):
+    user_prompt          : str                                # Raw user request (graph input)
+    plan                 : Plan                               # Set by plan_and_architect
+    task_plan            : TaskPlan                           # Set by plan_and_architect
+    coder_state          : CoderState                         # Progress through implementation_steps
+    status               : str                                # "DONE" once every step has run
\ No newline at end of file
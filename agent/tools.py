@@ -1,13 +1,22 @@
 # ─────────────────────────────────────────────────────────────────────────────
 # Imports: Core modules for path handling, subprocess execution, and typing
 # ─────────────────────────────────────────────────────────────────────────────
+import asyncio
+import hashlib
+import os
 import pathlib
+import shutil
 import subprocess
+import tempfile
+import threading
 import json
-from   typing               import Tuple
+from   typing               import Optional, Tuple
 
-# LangChain tool decorator for exposing functions to agent
-from   langchain_core.tools import tool
+# Async file I/O for the concurrent write path
+import aiofiles
+
+# LangChain tool decorator and tool class for exposing functions to agent
+from   langchain_core.tools import tool, StructuredTool
 
 # Modular imports for prompts
 from   agent.states         import ListFilesInput
@@ -15,49 +24,148 @@ from   agent.states         import ListFilesInput
 # ─────────────────────────────────────────────────────────────────────────────
 # Project root directory for all generated files
 # ─────────────────────────────────────────────────────────────────────────────
-PROJECT_ROOT = pathlib.Path.cwd() / "generated_project"
+_SHM_DIR   = pathlib.Path("/dev/shm")                       # RAM-backed tmpfs on Linux hosts
+_ROOT      = None                                           # Resolved root, set on first _project_root() call
+_TEMP_ROOT = False                                          # True when _ROOT is a private per-run dir under _SHM_DIR
+_ROOT_LOCK = threading.Lock()                               # Write threads may race to create the root
+
+
+def _project_root() -> pathlib.Path:
+    """
+    Returns the resolved project root, computed lazily on first use and cached.
+    Honors BUILDBUDDY_ROOT; otherwise creates a private (mode 0700) per-run directory
+    in RAM-backed /dev/shm when writable, falling back to ./generated_project.
+    The first call is serialized so concurrent writers always share one root.
+    """
+    global _ROOT, _TEMP_ROOT
+    if _ROOT is not None:
+        return _ROOT
+    with _ROOT_LOCK:
+        if _ROOT is None:
+            root = os.environ.get("BUILDBUDDY_ROOT")
+            if root:
+                _ROOT = pathlib.Path(root).resolve()
+            elif _SHM_DIR.is_dir() and os.access(_SHM_DIR, os.W_OK):
+                _ROOT      = pathlib.Path(tempfile.mkdtemp(prefix="buildbuddy-", dir=_SHM_DIR)).resolve()
+                _TEMP_ROOT = True
+            else:
+                _ROOT = (pathlib.Path.cwd() / "generated_project").resolve()
+        return _ROOT
+
+# ─────────────────────────────────────────────────────────────────────────────
+# In-memory workspace snapshot: resolved path → last content written or read
+# ─────────────────────────────────────────────────────────────────────────────
+_WORKSPACE_CACHE: dict[str, str]   = {}
+
+# SHA-256 digest of the content last written (or found on disk) per resolved path
+_CONTENT_HASHES : dict[str, bytes] = {}
+
+# Placed where coder prompts elide file content — must never reach the disk
+TRUNCATION_MARKER = "... [truncated — call read_file(path) for the full content] ..."
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Utility: Validates and resolves safe file paths within project root
 # ─────────────────────────────────────────────────────────────────────────────
 def safe_path_for_project(path: str) -> pathlib.Path:
     """
-    Resolves a given path relative to PROJECT_ROOT and ensures it's safe.
+    Resolves a given path relative to the project root and ensures it's safe.
     Prevents accidental writes outside the designated workspace.
     """
-    p = (PROJECT_ROOT / path).resolve()
-    if (
-            PROJECT_ROOT.resolve() not in p.parents
-            and PROJECT_ROOT.resolve() != p.parent
-            and PROJECT_ROOT.resolve() != p
-        ):
+    root = _project_root()
+    p    = (root / path).resolve()
+    try:
+        p.relative_to(root)
+    except ValueError:
         raise ValueError("Attempt to write outside project root")
     return p
 
 # ─────────────────────────────────────────────────────────────────────────────
-# Tool: Write content to a file within project root
+# Utility: Shared pre/post steps for the sync and async write paths
 # ─────────────────────────────────────────────────────────────────────────────
-@tool
-def write_file(path: str, content: str) -> str:
+def _record_write(p: pathlib.Path, content: str, digest: bytes) -> None:
+    """
+    Keeps the workspace snapshot and digest map in sync so later reads skip the disk.
+    """
+    _CONTENT_HASHES[str(p)]  = digest
+    _WORKSPACE_CACHE[str(p)] = content
+
+
+def _prepare_write(path: str, content: str) -> Tuple[pathlib.Path, str, bytes, bool]:
+    """
+    Resolves the target path, normalizes JSON content and computes its digest.
+    Returns (path, content, digest, unchanged) where unchanged flags a no-op write.
+    Refuses content that still carries the prompt truncation marker.
+    """
+    if TRUNCATION_MARKER in content:
+        raise ValueError("Refusing to write truncated content — read_file(path) and write the full file")
+
+    p   = safe_path_for_project(path)
+    key = str(p)
+
+    # Optional: try to decode escaped JSON if it looks like a JSON document
+    if content.lstrip().startswith(("{", "[")):
+        try:
+            parsed      = json.loads(content)
+            if isinstance(parsed, dict):
+                content = json.dumps(parsed, indent=2)
+        except json.JSONDecodeError:
+            pass  # Leave content as-is if not valid JSON
+
+    # Short-circuit no-op writes by comparing content digests
+    digest = hashlib.sha256(content.encode("utf-8")).digest()
+    known  = _CONTENT_HASHES.get(key)
+    if known is None:
+        if key in _WORKSPACE_CACHE:
+            known = hashlib.sha256(_WORKSPACE_CACHE[key].encode("utf-8")).digest()
+        elif p.is_file():
+            known = hashlib.sha256(p.read_bytes()).digest()
+    if known == digest:
+        _record_write(p, content, digest)
+        return p, content, digest, True
+
+    p.parent.mkdir(parents=True, exist_ok=True)
+    return p, content, digest, False
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Tool: Write content to a file within project root (sync + async paths)
+# ─────────────────────────────────────────────────────────────────────────────
+def _write_file(path: str, content: str) -> str:
     """
     Creates or overwrites a file at the given path.
     Ensures parent directories exist and writes UTF-8 encoded content.
+    Skips the write when the file already holds identical content.
     """
-    p = safe_path_for_project(path)
-    p.parent.mkdir(parents=True, exist_ok=True)
+    p, content, digest, unchanged = _prepare_write(path, content)
+    if unchanged:
+        return f"UNCHANGED:{p}"
 
-    # Optional: try to decode escaped JSON if it's valid
-    try:
-        content     = json.loads(content)
-        if isinstance(content, dict):
-            content = json.dumps(content, indent=2)
-    except json.JSONDecodeError:
-        pass  # Leave content as-is if not valid JSON
-
-    with open(p, "w", encoding="utf-8") as f:
-        f.write(content)
+    p.write_text(content, encoding="utf-8")
+    _record_write(p, content, digest)
     return f"WROTE:{p}"
 
+
+async def _awrite_file(path: str, content: str) -> str:
+    """
+    Async variant of write_file used by concurrent coder steps.
+    Resolves, hashes and creates directories in a worker thread and writes through
+    aiofiles, so the event loop is never blocked on disk I/O.
+    """
+    p, content, digest, unchanged = await asyncio.to_thread(_prepare_write, path, content)
+    if unchanged:
+        return f"UNCHANGED:{p}"
+
+    async with aiofiles.open(p, "w", encoding="utf-8") as f:
+        await f.write(content)
+    _record_write(p, content, digest)
+    return f"WROTE:{p}"
+
+
+write_file = StructuredTool.from_function(
+                                            func      = _write_file,
+                                            coroutine = _awrite_file,
+                                            name      = "write_file"
+                                         )
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Tool: Read content from a file within project root
 # ─────────────────────────────────────────────────────────────────────────────
@@ -65,13 +173,19 @@ def write_file(path: str, content: str) -> str:
 def read_file(path: str) -> str:
     """
     Reads UTF-8 content from the specified file.
+    Serves from the workspace snapshot when the file was already seen.
     Returns an empty string if the file does not exist.
     """
-    p = safe_path_for_project(path)
+    p      = safe_path_for_project(path)
+    cached = _WORKSPACE_CACHE.get(str(p))
+    if cached is not None:
+        return cached
     if not p.exists():
         return ""
-    with open(p, "r", encoding="utf-8") as f:
-        return f.read()
+    content = p.read_text(encoding="utf-8")
+
+    _WORKSPACE_CACHE[str(p)] = content
+    return content
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Tool: Return current working directory (project root)
@@ -82,7 +196,24 @@ def get_current_directory() -> str:
     Returns the absolute path of the project root directory.
     Used for context in agent prompts or shell commands.
     """
-    return str(PROJECT_ROOT)
+    return str(_project_root())
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Utility: Iteratively walk a directory tree, yielding file paths
+# ─────────────────────────────────────────────────────────────────────────────
+def _walk_files(root: str):
+    """
+    Yields the path of every regular file below root.
+    Uses os.scandir so file/dir checks reuse the cached readdir entry type.
+    """
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry.path
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Tool: List all files in a given directory within project root
@@ -98,7 +229,7 @@ def list_files(directory: str = ".") -> str:
     if not p.is_dir():
         return f"ERROR: {p} is not a directory"
 
-    files = [str(f.relative_to(PROJECT_ROOT)) for f in p.glob("**/*") if f.is_file()]
+    files = [os.path.relpath(f, _project_root()) for f in _walk_files(str(p))]
     return "\n".join(files) if files else "No files found."
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -110,7 +241,7 @@ def run_cmd(cmd: str, cwd: str = None, timeout: int = 30) -> Tuple[int, str, str
     Executes a shell command in the specified directory.
     Returns (exit_code, stdout, stderr). Defaults to project root.
     """
-    cwd_dir = safe_path_for_project(cwd) if cwd else PROJECT_ROOT
+    cwd_dir = safe_path_for_project(cwd) if cwd else _project_root()
     res     = subprocess.run(
                                 cmd,
                                 shell          = True,
@@ -129,5 +260,39 @@ def init_project_root():
     Ensures the project root directory exists.
     Used during setup or before the file operations.
     """
-    PROJECT_ROOT.mkdir(parents=True, exist_ok=True)
-    return str(PROJECT_ROOT)
\ No newline at end of file
+    _project_root().mkdir(parents=True, exist_ok=True)
+    return str(_project_root())
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Persist: Copy the generated project tree to persistent storage
+# ─────────────────────────────────────────────────────────────────────────────
+def persist_to(dest) -> Optional[str]:
+    """
+    Copies every file under the project root into dest (merged, overwriting).
+    Returns the path holding the generated files, or None when nothing was generated.
+    """
+    src  = _project_root()
+    dest = pathlib.Path(dest).resolve()
+    if not (src.is_dir() and any(src.iterdir())):
+        return None
+    if dest != src:
+        shutil.copytree(src, dest, dirs_exist_ok=True)
+    return str(dest)
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Cleanup: Remove the private per-run project root once it has been persisted
+# ─────────────────────────────────────────────────────────────────────────────
+def cleanup_project_root() -> None:
+    """
+    Deletes the per-run /dev/shm root and resets the path and content caches.
+    Roots chosen via BUILDBUDDY_ROOT or ./generated_project are left untouched.
+    """
+    global _ROOT, _TEMP_ROOT
+    with _ROOT_LOCK:
+        if not _TEMP_ROOT:
+            return
+        shutil.rmtree(_ROOT, ignore_errors=True)
+        _ROOT      = None
+        _TEMP_ROOT = False
+    _WORKSPACE_CACHE.clear()
+    _CONTENT_HASHES.clear()
\ No newline at end of file
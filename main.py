@@ -4,11 +4,16 @@
 
 # Core modules for argument parsing, error handling, and system exit
 import argparse
+import asyncio
+import pathlib
 import sys
 import traceback
 
-# Import compiled LangGraph agent from graph definition
-from agent.graph import agent
+# Run the compiled LangGraph agent (closes its HTTP client when the run ends)
+from agent.graph import run_agent
+
+# Copies generated files out of the (possibly RAM-backed) project root, then removes it
+from agent.tools import persist_to, cleanup_project_root
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Main function: Handles CLI input, agent invocation, and error management
@@ -29,10 +34,11 @@ def main():
         user_prompt = input("Enter your project prompt: ")
 
         # Invoke LangGraph agent with user input and recursion control
-        result      = agent.invoke(
-                                    {"user_prompt"     : user_prompt},
-                                    {"recursion_limit" : args.recursion_limit}
-                                  )
+        # (async entry point — the coder node runs independent steps concurrently)
+        result      = asyncio.run(run_agent(
+                                            {"user_prompt"     : user_prompt},
+                                            {"recursion_limit" : args.recursion_limit}
+                                           ))
 
         # Display final state returned by agent
         print("Final State:", result)
@@ -48,6 +54,14 @@ def main():
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
+    finally:
+        # Save generated files to ./generated_project even after a failure or Ctrl+C,
+        # then drop the per-run RAM-backed root (kept if the copy itself fails)
+        saved = persist_to(pathlib.Path.cwd() / "generated_project")
+        if saved:
+            print("Project saved to:", saved)
+        cleanup_project_root()
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Script trigger: Executes main() when run directly
 # ─────────────────────────────────────────────────────────────────────────────